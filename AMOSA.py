@@ -14,13 +14,15 @@ You should have received a copy of the GNU General Public License along with
 RMEncoder; if not, write to the Free Software Foundation, Inc., 51 Franklin
 Street, Fifth Floor, Boston, MA 02110-1301, USA.
 """
-import sys, copy, random, time, os, json, warnings, math
+import sys, random, time, os, json, pickle, sqlite3, math
 import numpy as np
-import matplotlib.pyplot as plt
 from enum import Enum
+from dataclasses import dataclass
 from multiprocessing import cpu_count, Pool
 from distutils.dir_util import mkpath
 from itertools import islice
+from functools import partial
+from contextlib import closing, nullcontext
 
 from typing import Literal, Union, List
 
@@ -33,31 +35,33 @@ class MultiFileCacheHandle:
     def read(self):
         cache = {}
         if os.path.isdir(self.directory):
-            for f in os.listdir(self.directory):
-                if f.endswith(".json"):
-                    with open(f"{self.directory}/{f}") as j:
-                        tmp = json.load(j)
-                        cache = {**cache, **tmp}
+            for f in sorted(os.listdir(self.directory)):
+                if f.endswith(".pkl"):
+                    with open(f"{self.directory}/{f}", "rb") as p:
+                        cache.update(pickle.load(p))
         print(f"{len(cache)} cache entries loaded from {self.directory}")
         return cache
 
     def write(self, cache: dict):
         if os.path.isdir(self.directory):
             for file in os.listdir(self.directory):
-                if file.endswith(".json"):
+                if file.endswith(".json") or file.endswith(".pkl"):
                     os.remove(f"{self.directory}/{file}")
         else:
             mkpath(self.directory)
-        total_entries = len(cache)
-        total_size = sys.getsizeof(json.dumps(cache))
-        avg_entry_size = math.ceil(total_size / total_entries)
-        max_entries_per_file = int(self.max_size_mb * (2**20) / avg_entry_size)
-        splits = int(math.ceil(total_entries / max_entries_per_file))
-        for item, count in zip(
-            MultiFileCacheHandle.chunks(cache, max_entries_per_file), range(splits)
+        data = pickle.dumps(cache, pickle.HIGHEST_PROTOCOL)
+        max_size = self.max_size_mb * (2**20)
+        if len(data) <= max_size:
+            with open(f"{self.directory}/{0:09d}.pkl", "wb") as outfile:
+                outfile.write(data)
+            return
+        # the whole cache has already been serialized once, so its size gives the amount of entries per shard
+        max_entries_per_file = max(int(max_size * len(cache) / len(data)), 1)
+        for count, item in enumerate(
+            MultiFileCacheHandle.chunks(cache, max_entries_per_file)
         ):
-            with open(f"{self.directory}/{count:09d}.json", "w") as outfile:
-                outfile.write(json.dumps(item))
+            with open(f"{self.directory}/{count:09d}.pkl", "wb") as outfile:
+                pickle.dump(item, outfile, pickle.HIGHEST_PROTOCOL)
 
     @staticmethod
     def chunks(data, max_entries):
@@ -66,59 +70,97 @@ class MultiFileCacheHandle:
             yield {k: data[k] for k in islice(it, max_entries)}
 
 
+class SQLiteCacheHandle:
+    def __init__(self, directory: str, filename="cache.sqlite"):
+        self.directory = directory
+        self.database = f"{directory}/{filename}"
+
+    def read(self):
+        cache = {}
+        if os.path.isfile(self.database):
+            with closing(sqlite3.connect(self.database)) as connection:
+                for key, value in connection.execute("SELECT key, value FROM cache"):
+                    cache[pickle.loads(key)] = pickle.loads(value)
+        print(f"{len(cache)} cache entries loaded from {self.database}")
+        return cache
+
+    def write(self, cache: dict, skip: int = 0):
+        # entries are never removed from the cache, and dicts preserve insertion order: the first "skip" entries are
+        # the ones already stored, so that only those added since then are written
+        if not os.path.isdir(self.directory):
+            mkpath(self.directory)
+        with closing(sqlite3.connect(self.database)) as connection:
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, value BLOB)"
+                )
+                connection.executemany(
+                    "INSERT OR IGNORE INTO cache VALUES (?, ?)",
+                    (
+                        (
+                            pickle.dumps(k, pickle.HIGHEST_PROTOCOL),
+                            pickle.dumps(v, pickle.HIGHEST_PROTOCOL),
+                        )
+                        for k, v in islice(cache.items(), skip, None)
+                    ),
+                )
+
+
+@dataclass
 class AMOSAConfig:
-    def __init__(
-        self,
-        archive_hard_limit=20,
-        archive_soft_limit=50,
-        archive_gamma=2,
-        clustering_max_iterations=300,
-        hill_climbing_iterations=500,
-        initial_temperature=500,
-        final_temperature=0.000001,
-        cooling_factor=0.9,
-        annealing_iterations=500,
-        annealing_strength=1,
-        early_termination_window=0,
-        multiprocessing_enabled=True,
-    ):
+    archive_hard_limit: int = 20
+    archive_soft_limit: int = 50
+    archive_gamma: int = 2
+    clustering_max_iterations: int = 300
+    hill_climbing_iterations: int = 500
+    initial_temperature: float = 500
+    final_temperature: float = 0.000001
+    cooling_factor: float = 0.9
+    annealing_iterations: int = 500
+    annealing_strength: int = 1
+    early_termination_window: int = 0
+    multiprocessing_enabled: bool = True
+
+    def __post_init__(self):
         assert (
-            archive_soft_limit >= archive_hard_limit > 0
-        ), f"soft limit: {archive_soft_limit}, hard limit: {archive_hard_limit}"
-        assert archive_gamma > 0, f"gamma: {archive_gamma}"
+            self.archive_soft_limit >= self.archive_hard_limit > 0
+        ), f"soft limit: {self.archive_soft_limit}, hard limit: {self.archive_hard_limit}"
+        assert self.archive_gamma > 0, f"gamma: {self.archive_gamma}"
         assert (
-            clustering_max_iterations > 0
-        ), f"clustering iterations: {clustering_max_iterations}"
+            self.clustering_max_iterations > 0
+        ), f"clustering iterations: {self.clustering_max_iterations}"
         assert (
-            hill_climbing_iterations >= 0
-        ), f"hill-climbing iterations: {hill_climbing_iterations}"
+            self.hill_climbing_iterations >= 0
+        ), f"hill-climbing iterations: {self.hill_climbing_iterations}"
         assert (
-            initial_temperature > final_temperature > 0
-        ), f"initial temperature: {initial_temperature}, final temperature: {final_temperature}"
-        assert 0 < cooling_factor < 1, f"cooling factor: {cooling_factor}"
-        assert annealing_iterations > 0, f"annealing iterations: {annealing_strength}"
-        assert annealing_strength >= 1, f"annealing strength: {annealing_strength}"
+            self.initial_temperature > self.final_temperature > 0
+        ), f"initial temperature: {self.initial_temperature}, final temperature: {self.final_temperature}"
+        assert 0 < self.cooling_factor < 1, f"cooling factor: {self.cooling_factor}"
         assert (
-            early_termination_window >= 0
-        ), f"early-termination window: {early_termination_window}"
-        self.archive_hard_limit = archive_hard_limit
-        self.archive_soft_limit = archive_soft_limit
-        self.clustering_max_iterations = clustering_max_iterations
-        self.archive_gamma = archive_gamma
-        self.hill_climbing_iterations = hill_climbing_iterations
-        self.initial_temperature = initial_temperature
-        self.final_temperature = final_temperature
-        self.cooling_factor = cooling_factor
-        self.annealing_iterations = annealing_iterations
-        self.annealing_strength = annealing_strength
-        self.early_terminator_window = early_termination_window
-        self.multiprocessing_enabled = multiprocessing_enabled
+            self.annealing_iterations > 0
+        ), f"annealing iterations: {self.annealing_iterations}"
+        assert (
+            self.annealing_strength >= 1
+        ), f"annealing strength: {self.annealing_strength}"
+        assert (
+            self.early_termination_window >= 0
+        ), f"early-termination window: {self.early_termination_window}"
+
+    # former name of the early_termination_window attribute, still used by existing scripts
+    @property
+    def early_terminator_window(self):
+        return self.early_termination_window
+
+    @early_terminator_window.setter
+    def early_terminator_window(self, value):
+        self.early_termination_window = value
 
 
 class AMOSA:
     hill_climb_checkpoint_file = "hill_climb_checkpoint.json"
     minimize_checkpoint_file = "minimize_checkpoint.json"
     cache_dir = ".cache"
+    worker_problem = None
 
     class Type(Enum):
         INTEGER = 0
@@ -160,40 +202,260 @@ class AMOSA:
                 ), f"Type mismatch. Value {ub} in upper_bound is not suitable for {t}"
             self.lower_bound = lower_bounds
             self.upper_bound = upper_bounds
+            # integer mask and Python types of the decision variables, looked up for each perturbation and evaluation
+            self.is_integer = [t == AMOSA.Type.INTEGER for t in self.types]
+            self.variable_types = [int if i else float for i in self.is_integer]
             self.cache = {}
+            self.stored_entries = 0
             self.total_calls = 0
             self.cache_hits = 0
             self.max_attempt = self.num_of_variables
 
+        def __getstate__(self):
+            # the cache is not pickled along with the problem, as it may hold millions of entries. Forked workers
+            # inherit the problem, cache included, through the pool initializer, without pickling it at all
+            state = self.__dict__.copy()
+            state["cache"] = {}
+            return state
+
         def evaluate(self, x, out):
             pass
 
+        def evaluate_batch(self, X, out):
+            """
+            Evaluates several solutions at once: X is the list of their decision-variables vectors, while out["f"] and
+            out["g"] are lists, as long as X, to be filled with the objectives and constraints of the corresponding
+            solution. Problems whose objectives can be computed in a vectorized fashion may override this method; the
+            default implementation just calls evaluate() on each of the solutions.
+            """
+            for i, x in enumerate(X):
+                o = {
+                    "f": [0] * self.num_of_objectives,
+                    "g": [0] * self.num_of_constraints
+                    if self.num_of_constraints > 0
+                    else None,
+                }
+                self.evaluate(x, o)
+                out["f"][i] = o["f"]
+                out["g"][i] = o["g"]
+
         def optimums(self):
             return []
 
         @staticmethod
         def get_cache_key(s):
-            return "".join([str(i) for i in s["x"]])
+            return tuple(s["x"])
 
         def is_cached(self, s):
-            return True if self.get_cache_key(s) in self.cache.keys() else False
+            return self.get_cache_key(s) in self.cache
 
         def add_to_cache(self, s):
             self.cache[self.get_cache_key(s)] = {"f": s["f"], "g": s["g"]}
 
         def load_cache(self, directory):
-            handler = MultiFileCacheHandle(directory)
+            handler = SQLiteCacheHandle(directory)
             self.cache = handler.read()
+            self.stored_entries = len(self.cache)
 
         def store_cache(self, directory):
-            handler = MultiFileCacheHandle(directory)
-            handler.write(self.cache)
+            handler = SQLiteCacheHandle(directory)
+            handler.write(self.cache, self.stored_entries)
+            self.stored_entries = len(self.cache)
 
         def archive_to_cache(self, archive):
             for s in archive:
                 if not self.is_cached(s):
                     self.add_to_cache(s)
 
+    class Archive:
+        """
+        Structure-of-arrays view of an archive: solutions are kept in a list, while their decision variables,
+        objective and constraint values are stacked, row by row, into the X, F and G matrices, so that a candidate
+        solution can be compared against the whole archive at once.
+        """
+
+        def __init__(self, problem, solutions: List[dict], capacity: int = 0):
+            self.solutions = list(solutions)
+            self.__X = AMOSA.Archive.stack(
+                [s["x"] for s in self.solutions], problem.num_of_variables, capacity
+            )
+            self.__F = AMOSA.Archive.stack(
+                [s["f"] for s in self.solutions], problem.num_of_objectives, capacity
+            )
+            self.__G = (
+                AMOSA.Archive.stack(
+                    [s["g"] for s in self.solutions],
+                    problem.num_of_constraints,
+                    capacity,
+                )
+                if problem.num_of_constraints > 0
+                else None
+            )
+            self.update_bounds()
+
+        @staticmethod
+        def stack(rows, width, capacity: int = 0):
+            # rows are copied into a preallocated buffer, so that appending a solution does not reallocate the matrix
+            buffer = np.empty(
+                (max(len(rows), capacity), len(rows[0]) if len(rows) > 0 else width),
+                dtype=np.float64,
+            )
+            if len(rows) > 0:
+                buffer[: len(rows)] = rows
+            return buffer
+
+        @staticmethod
+        def append(buffer, size: int, row):
+            if size == len(buffer):
+                # capacity is doubled whenever the buffer is full, so appends take amortized constant time
+                buffer = np.concatenate(
+                    (
+                        buffer,
+                        np.empty((max(size, 1), buffer.shape[1]), dtype=np.float64),
+                    )
+                )
+            buffer[size] = row
+            return buffer
+
+        @property
+        def X(self):
+            return self.__X[: len(self.solutions)]
+
+        @property
+        def F(self):
+            return self.__F[: len(self.solutions)]
+
+        @property
+        def G(self):
+            return self.__G[: len(self.solutions)] if self.__G is not None else None
+
+        def __len__(self):
+            return len(self.solutions)
+
+        def update_bounds(self):
+            # column-wise extrema of F, kept up to date by add() so that the fitness range does not need a full pass
+            # over the archive at each annealing iteration
+            if len(self.solutions) > 0:
+                self.f_min = np.nanmin(self.F, axis=0)
+                self.f_max = np.nanmax(self.F, axis=0)
+            else:
+                self.f_min = np.full(self.__F.shape[1], np.nan)
+                self.f_max = np.full(self.__F.shape[1], np.nan)
+
+        def classify(self, current_point: dict, new_point: dict):
+            """
+            Computes, with a single conversion of the new point, the fitness range of the archive extended with both
+            points, and the masks of the archived solutions dominating and dominated by the new point.
+            """
+            x_f = np.asarray(current_point["f"], dtype=np.float64)
+            y_f = np.asarray(new_point["f"], dtype=np.float64)
+            fitness_range = np.fmax(self.f_max, np.fmax(x_f, y_f)) - np.fmin(
+                self.f_min, np.fmin(x_f, y_f)
+            )
+            return (
+                fitness_range,
+                *AMOSA.dominance_masks(
+                    self.F,
+                    self.G,
+                    y_f,
+                    np.asarray(new_point["g"], dtype=np.float64)
+                    if self.__G is not None
+                    else None,
+                ),
+            )
+
+        def add(self, x: dict):
+            if len(self.solutions) == 0:
+                # the widths of F and G are taken from the data, as evaluate() may not match the declared sizes
+                self.__X = AMOSA.Archive.stack([x["x"]], None, len(self.__X))
+                self.__F = AMOSA.Archive.stack([x["f"]], None, len(self.__F))
+                if self.__G is not None:
+                    self.__G = AMOSA.Archive.stack([x["g"]], None, len(self.__G))
+                self.solutions = [x]
+                self.update_bounds()
+                return
+            keep, insert = AMOSA.insertion(self.X, self.F, self.G, x)
+            size = np.count_nonzero(keep)
+            if size < len(self.solutions):
+                # surviving rows are compacted at the head of the buffers, in place
+                self.__X[:size] = self.X[keep]
+                self.__F[:size] = self.F[keep]
+                if self.__G is not None:
+                    self.__G[:size] = self.G[keep]
+                self.solutions = [s for s, k in zip(self.solutions, keep) if k]
+                self.update_bounds()
+            if insert:
+                x_f = np.asarray(x["f"], dtype=np.float64)
+                self.__X = AMOSA.Archive.append(self.__X, len(self.solutions), x["x"])
+                self.__F = AMOSA.Archive.append(self.__F, len(self.solutions), x_f)
+                if self.__G is not None:
+                    self.__G = AMOSA.Archive.append(
+                        self.__G, len(self.solutions), x["g"]
+                    )
+                self.solutions.append(x)
+                self.f_min = np.fmin(self.f_min, x_f)
+                self.f_max = np.fmax(self.f_max, x_f)
+
+        def select(self, indexes, capacity: int = 0):
+            """
+            Returns a new archive made of the given rows, copied directly from the matrices of this one.
+            """
+            indexes = np.asarray(indexes, dtype=np.intp)
+            selected = AMOSA.Archive.__new__(AMOSA.Archive)
+            selected.solutions = [self.solutions[i] for i in indexes]
+            selected.__X = AMOSA.Archive.stack(
+                self.X[indexes], self.__X.shape[1], capacity
+            )
+            selected.__F = AMOSA.Archive.stack(
+                self.F[indexes], self.__F.shape[1], capacity
+            )
+            selected.__G = (
+                AMOSA.Archive.stack(self.G[indexes], self.__G.shape[1], capacity)
+                if self.__G is not None
+                else None
+            )
+            selected.update_bounds()
+            return selected
+
+        def cluster(
+            self, hard_limit: int, max_iterations: int, print_allowed, capacity: int = 0
+        ):
+            if self.__G is not None:
+                feasible = np.flatnonzero((self.G <= 0).all(axis=1))
+                unfeasible = np.flatnonzero((self.G > 0).any(axis=1))
+                if len(feasible) > hard_limit:
+                    selected = feasible[
+                        AMOSA.kmeans_clustering(
+                            self.F[feasible],
+                            self.X[feasible],
+                            hard_limit,
+                            max_iterations,
+                            print_allowed,
+                        )
+                    ]
+                elif len(feasible) < hard_limit and len(unfeasible) != 0:
+                    selected = np.concatenate(
+                        (
+                            feasible,
+                            unfeasible[
+                                AMOSA.kmeans_clustering(
+                                    self.F[unfeasible],
+                                    self.X[unfeasible],
+                                    hard_limit - len(feasible),
+                                    max_iterations,
+                                    print_allowed,
+                                )
+                            ],
+                        )
+                    )
+                else:
+                    selected = feasible
+            else:
+                selected = AMOSA.kmeans_clustering(
+                    self.F, self.X, hard_limit, max_iterations, print_allowed
+                )
+            return self.select(selected, capacity)
+
     @staticmethod
     def is_the_same(x: dict, y: dict) -> bool:
         return x["x"] == y["x"]
@@ -203,16 +465,20 @@ class AMOSA:
         return x["x"] != y["x"]
 
     @staticmethod
-    def get_objectives(problem: Problem, s: dict):
-        for i, t in zip(s["x"], problem.types):
+    def check_types(problem: Problem, s: dict):
+        for i, tp, t in zip(s["x"], problem.variable_types, problem.types):
             assert isinstance(
-                i, int if t == AMOSA.Type.INTEGER else float
+                i, tp
             ), f"Type mismatch. This decision variable is {t}, but the internal type is {type(i)}. Please repurt this bug"
+
+    @staticmethod
+    def get_objectives(problem: Problem, s: dict):
+        AMOSA.check_types(problem, s)
         problem.total_calls += 1
         # if s["x"] is in the cache, do not call problem.evaluate, but return the cached-entry
-        if problem.is_cached(s):
-            s["f"] = problem.cache[problem.get_cache_key(s)]["f"]
-            s["g"] = problem.cache[problem.get_cache_key(s)]["g"]
+        entry = problem.cache.get(problem.get_cache_key(s))
+        if entry is not None:
+            s["f"], s["g"] = entry["f"], entry["g"]
             problem.cache_hits += 1
         else:
             # if s["x"] is not in the cache, call "evaluate" and add s["x"] to the cache
@@ -227,30 +493,69 @@ class AMOSA:
             s["g"] = out["g"]
             problem.add_to_cache(s)
 
+    @staticmethod
+    def get_objectives_batch(problem: Problem, S: List[dict]):
+        # cached solutions are served from the cache, while all the others are evaluated by a single call to
+        # problem.evaluate_batch
+        to_be_evaluated = []
+        for s in S:
+            AMOSA.check_types(problem, s)
+            problem.total_calls += 1
+            entry = problem.cache.get(problem.get_cache_key(s))
+            if entry is not None:
+                s["f"], s["g"] = entry["f"], entry["g"]
+                problem.cache_hits += 1
+            else:
+                to_be_evaluated.append(s)
+        if len(to_be_evaluated) > 0:
+            out = {
+                "f": [None] * len(to_be_evaluated),
+                "g": [None] * len(to_be_evaluated),
+            }
+            problem.evaluate_batch([s["x"] for s in to_be_evaluated], out)
+            for s, f, g in zip(to_be_evaluated, out["f"], out["g"]):
+                s["f"] = list(f)
+                s["g"] = list(g) if problem.num_of_constraints > 0 else None
+                problem.add_to_cache(s)
+
     @staticmethod
     def dominates(x: dict, y: dict) -> bool:
         if x["g"] is None:
-            return all(i <= j for i, j in zip(x["f"], y["f"])) and any(
-                i < j for i, j in zip(x["f"], y["f"])
-            )
+            return AMOSA.dominates_unconstrained(x, y)
         else:
-            return (
-                AMOSA.x_is_feasible_while_y_is_nor(x, y)
-                or AMOSA.both_infeasible_but_x_is_better(x, y)
-                or AMOSA.both_feasible_but_x_is_better(x, y)
-            )
+            return AMOSA.dominates_constrained(x, y)
+
+    @staticmethod
+    def dominates_unconstrained(x: dict, y: dict) -> bool:
+        return AMOSA.vector_dominates(x["f"], y["f"])
+
+    @staticmethod
+    def dominates_constrained(x: dict, y: dict) -> bool:
+        return (
+            AMOSA.x_is_feasible_while_y_is_nor(x, y)
+            or AMOSA.both_infeasible_but_x_is_better(x, y)
+            or AMOSA.both_feasible_but_x_is_better(x, y)
+        )
+
+    @staticmethod
+    def dominance_function(problem: Problem):
+        # the domination test is specialized once per problem, instead of checking constraints at each call
+        return (
+            AMOSA.dominates_constrained
+            if problem.num_of_constraints > 0
+            else AMOSA.dominates_unconstrained
+        )
 
     @staticmethod
     def x_is_feasible_while_y_is_nor(x: dict, y: dict) -> bool:
-        return all(i <= 0 for i in x["f"]) and any(i > 0 for i in y["g"])
+        return all(i <= 0 for i in x["g"]) and any(i > 0 for i in y["g"])
 
     @staticmethod
     def both_infeasible_but_x_is_better(x: dict, y: dict) -> bool:
         return (
             any(i > 0 for i in x["g"])
             and any(i > 0 for i in y["g"])
-            and all([i <= j for i, j in zip(x["g"], y["g"])])
-            and any([i < j for i, j in zip(x["g"], y["g"])])
+            and AMOSA.vector_dominates(x["g"], y["g"])
         )
 
     @staticmethod
@@ -258,10 +563,49 @@ class AMOSA:
         return (
             all(i <= 0 for i in x["g"])
             and all(i <= 0 for i in y["g"])
-            and all([i <= j for i, j in zip(x["f"], y["f"])])
-            and any([i < j for i, j in zip(x["f"], y["f"])])
+            and AMOSA.vector_dominates(x["f"], y["f"])
         )
 
+    @staticmethod
+    def vector_dominates(a, b) -> bool:
+        # single pass with early exit on the first component where a is worse than b
+        strictly_better = False
+        for i, j in zip(a, b):
+            if not i <= j:
+                return False
+            if i < j:
+                strictly_better = True
+        return strictly_better
+
+    @staticmethod
+    def dominance_masks(F: np.ndarray, G: np.ndarray, y_f: np.ndarray, y_g: np.ndarray):
+        """
+        Vectorized counterpart of dominates(): returns the boolean masks of the rows of F (and G) dominating the
+        solution y, given its objectives y_f and constraints y_g, and of those dominated by y, respectively.
+        """
+        f_le = (F <= y_f).all(axis=1)
+        f_ge = (F >= y_f).all(axis=1)
+        f_lt = (F < y_f).any(axis=1)
+        f_gt = (F > y_f).any(axis=1)
+        if G is None:
+            return f_le & f_lt, f_ge & f_gt
+        y_feasible = (y_g <= 0).all()
+        s_feasible = (G <= 0).all(axis=1)
+        s_infeasible = (G > 0).any(axis=1)
+        both_infeasible = s_infeasible & (y_g > 0).any()
+        both_feasible = s_feasible & y_feasible
+        s_dominating_y = (
+            (s_feasible & (y_g > 0).any())
+            | (both_infeasible & (G <= y_g).all(axis=1) & (G < y_g).any(axis=1))
+            | (both_feasible & f_le & f_lt)
+        )
+        s_dominated_by_y = (
+            (y_feasible & s_infeasible)
+            | (both_infeasible & (G >= y_g).all(axis=1) & (G > y_g).any(axis=1))
+            | (both_feasible & f_ge & f_gt)
+        )
+        return s_dominating_y, s_dominated_by_y
+
     @staticmethod
     def lower_point(problem: Problem) -> dict:
         x = {
@@ -288,93 +632,135 @@ class AMOSA:
 
     @staticmethod
     def random_point(problem: Problem) -> dict:
-        x = {
-            "x": [
-                lb
-                if lb == ub
-                else random.randrange(lb, ub)
-                if tp == AMOSA.Type.INTEGER
-                else random.uniform(lb, ub)
-                for lb, ub, tp in zip(
-                    problem.lower_bound, problem.upper_bound, problem.types
-                )
-            ],
-            "f": [0] * problem.num_of_objectives,
-            "g": [0] * problem.num_of_constraints
-            if problem.num_of_constraints > 0
-            else None,
-        }
+        x = AMOSA.random_solution(problem)
         AMOSA.get_objectives(problem, x)
         return x
 
+    @staticmethod
+    def random_points(problem: Problem, n: int) -> List[dict]:
+        points = AMOSA.random_solutions(problem, n)
+        AMOSA.get_objectives_batch(problem, points)
+        return points
+
+    @staticmethod
+    def random_solution(problem: Problem) -> dict:
+        return AMOSA.random_solutions(problem, 1)[0]
+
+    @staticmethod
+    def random_solutions(problem: Problem, n: int) -> List[dict]:
+        # decision variables of all the n solutions are drawn at once, by a generator seeded from the random module,
+        # which is reseeded in each forked worker. Integer variables are drawn in [lb, ub), as random.randrange() does
+        rng = np.random.default_rng(random.getrandbits(64))
+        X = rng.uniform(
+            problem.lower_bound, problem.upper_bound, (n, problem.num_of_variables)
+        ).tolist()
+        integers = [i for i, integer in enumerate(problem.is_integer) if integer]
+        if len(integers) > 0:
+            lb = np.array([problem.lower_bound[i] for i in integers])
+            ub = np.array([problem.upper_bound[i] for i in integers])
+            for x, values in zip(
+                X, rng.integers(lb, np.maximum(ub, lb + 1), (n, len(integers))).tolist()
+            ):
+                for i, v in zip(integers, values):
+                    x[i] = v
+        return [
+            {
+                "x": x,
+                "f": [0] * problem.num_of_objectives,
+                "g": [0] * problem.num_of_constraints
+                if problem.num_of_constraints > 0
+                else None,
+            }
+            for x in X
+        ]
+
+    @staticmethod
+    def copy_solution(s: dict) -> dict:
+        # only the decision variables are modified in place: objectives and constraints are always replaced as a whole
+        # by get_objectives(), so they can be shared with the original solution
+        return {"x": list(s["x"]), "f": s["f"], "g": s["g"]}
+
     @staticmethod
     def random_perturbation(problem: Problem, s: dict, strength) -> dict:
-        z = copy.deepcopy(s)
+        z = AMOSA.copy_solution(s)
         # while z["x"] is in the cache, repeat the random perturbation
         # a safety-exit prevents infinite loop, using a counter variable
         safety_exit = problem.max_attempt
-        while safety_exit >= 0 and problem.is_cached(z):
+        cache, cache_key = problem.cache, problem.get_cache_key
+        lower_bound, upper_bound, is_integer = (
+            problem.lower_bound,
+            problem.upper_bound,
+            problem.is_integer,
+        )
+        variables = range(problem.num_of_variables)
+        max_strength = 1 + min(strength, problem.num_of_variables)
+        sample, randrange, uniform = random.sample, random.randrange, random.uniform
+        x = z["x"]
+        while safety_exit >= 0 and cache_key(z) in cache:
             safety_exit -= 1
-            indexes = random.sample(
-                range(problem.num_of_variables),
-                random.randrange(1, 1 + min([strength, problem.num_of_variables])),
-            )
-            for i in indexes:
-                lb = problem.lower_bound[i]
-                ub = problem.upper_bound[i]
-                tp = problem.types[i]
-                z["x"][i] = (
+            for i in sample(variables, randrange(1, max_strength)):
+                lb = lower_bound[i]
+                ub = upper_bound[i]
+                x[i] = (
                     lb
                     if lb == ub
-                    else random.randrange(lb, ub)
-                    if tp == AMOSA.Type.INTEGER
-                    else random.uniform(lb, ub)
+                    else randrange(lb, ub)
+                    if is_integer[i]
+                    else uniform(lb, ub)
                 )
         AMOSA.get_objectives(problem, z)
         return z
 
     @staticmethod
-    def accept(probability: float) -> bool:
-        return random.random() < probability
+    def accept(probability: float, threshold: float = None) -> bool:
+        return (random.random() if threshold is None else threshold) < probability
 
     @staticmethod
     def sigmoid(x):
-        return 1 / (1 + np.exp(np.array(-x, dtype=np.longdouble)))
+        # evaluated in the numerically-stable form, so that math.exp() never overflows
+        if x >= 0:
+            return 1.0 / (1.0 + math.exp(-x))
+        z = math.exp(x)
+        return z / (1.0 + z)
 
     @staticmethod
     def domination_amount(x, y, r):
-        return np.prod([abs(i - j) / k for i, j, k in zip(x["f"], y["f"], r)])
+        # a single pair of solutions, with a handful of objectives: math.prod avoids building an array for them
+        return math.prod(abs(i - j) / k for i, j, k in zip(x["f"], y["f"], r))
 
     @staticmethod
-    def compute_fitness_range(archive: List[dict], current_point, new_point):
-        f = [s["f"] for s in archive] + [current_point["f"], new_point["f"]]
-        return np.nanmax(f, axis=0) - np.nanmin(f, axis=0)
+    def domination_amounts(F: np.ndarray, y, r):
+        return np.prod(np.abs(F - np.asarray(y["f"], dtype=np.float64)) / r, axis=1)
 
     @staticmethod
     def hill_climbing(problem: Problem, x, max_iterations):
-        d, up = AMOSA.hill_climbing_direction(problem)
+        dominates = AMOSA.dominance_function(problem)
+        copy_solution = AMOSA.copy_solution
+        adaptive_step = AMOSA.hill_climbing_adaptive_step
+        direction = AMOSA.hill_climbing_direction
+        d, up = direction(problem)
         for _ in range(max_iterations):
-            y = copy.deepcopy(x)
-            AMOSA.hill_climbing_adaptive_step(problem, y, d, up)
-            if AMOSA.dominates(y, x) and AMOSA.not_the_same(y, x):
+            y = copy_solution(x)
+            adaptive_step(problem, y, d, up)
+            # y only differs from x in its d-th variable, so there is no need to compare the whole vectors
+            if y["x"][d] != x["x"][d] and dominates(y, x):
                 x = y
             else:
-                d, up = AMOSA.hill_climbing_direction(problem, d)
+                d, up = direction(problem, d)
         return x
 
     @staticmethod
     def hill_climbing_direction(problem: Problem, c_d=None):
-        if c_d is None:
-            return (
-                random.randrange(0, problem.num_of_variables),
-                1 if random.random() > 0.5 else -1,
-            )
+        # a single draw selects both the variable and the verse of the step. A new direction has to change the variable
+        # c_d, so draws landing on it or past it are shifted by one variable, instead of being rejected. A problem with
+        # a single variable can only change the verse.
+        if c_d is None or problem.num_of_variables == 1:
+            r = random.randrange(2 * problem.num_of_variables)
         else:
-            up = 1 if random.random() > 0.5 else -1
-            d = random.randrange(0, problem.num_of_variables)
-            while c_d == d:
-                d = random.randrange(0, problem.num_of_variables)
-            return d, up
+            r = random.randrange(2 * (problem.num_of_variables - 1))
+            if r >> 1 >= c_d:
+                r += 2
+        return r >> 1, (r & 1) * 2 - 1
 
     @staticmethod
     def hill_climbing_adaptive_step(
@@ -383,67 +769,75 @@ class AMOSA:
         # while z["x"] is in the cache, repeat the random perturbation
         # a safety-exit prevents infinite loop, using a counter variable
         safety_exit = problem.max_attempt
-        while safety_exit >= 0 and problem.is_cached(s):
+        cache, cache_key = problem.cache, problem.get_cache_key
+        while safety_exit >= 0 and cache_key(s) in cache:
             safety_exit -= 1
-            lower_bound = problem.lower_bound[d] - s["x"][d]
-            upper_bound = problem.upper_bound[d] - s["x"][d]
-            if (up == -1 and lower_bound == 0) or (up == 1 and upper_bound == 0):
+            # signed distance from the bound being approached
+            width = (problem.upper_bound[d] if up == 1 else problem.lower_bound[d]) - s[
+                "x"
+            ][d]
+            if width == 0:
                 return 0
-            if problem.types[d] == AMOSA.Type.INTEGER:
-                step = (
-                    random.randrange(lower_bound, 0)
-                    if up == -1
-                    else random.randrange(0, upper_bound + 1)
-                )
-                while step == 0:
-                    step = (
-                        random.randrange(lower_bound, 0)
-                        if up == -1
-                        else random.randrange(0, upper_bound + 1)
-                    )
+            # steps are drawn from ranges that exclude zero by construction, so no rejection-loop is needed
+            if problem.is_integer[d]:
+                step = up * random.randrange(1, abs(width) + 1)
             else:
-                step = (
-                    random.uniform(lower_bound, 0)
-                    if up == -1
-                    else random.uniform(0, upper_bound)
-                )
-                while step == 0:
-                    step = (
-                        random.uniform(lower_bound, 0)
-                        if up == -1
-                        else random.uniform(0, upper_bound)
-                    )
+                step = width * (1.0 - random.random())
             s["x"][d] += step
         AMOSA.get_objectives(problem, s)
 
+    @staticmethod
+    def insertion(X: np.ndarray, F: np.ndarray, G: np.ndarray, x: dict):
+        """
+        Returns the mask of the archived solutions, stacked into X, F and G, that survive the insertion of x, i.e. those
+        not dominated by x, and whether x has to be inserted, i.e. whether it is neither dominated by nor a copy of any
+        of them. Both come from a single pass over the archive: since neither a solution dominating x nor a copy of x
+        can be dominated by x, the insertion test does not depend on the removal.
+        """
+        dominating_x, dominated_by_x = AMOSA.dominance_masks(
+            F,
+            G,
+            np.asarray(x["f"], dtype=np.float64),
+            np.asarray(x["g"], dtype=np.float64) if G is not None else None,
+        )
+        return (
+            ~dominated_by_x,
+            not dominating_x.any()
+            and not (X == np.asarray(x["x"], dtype=np.float64)).all(axis=1).any(),
+        )
+
     @staticmethod
     def add_to_archive(archive: list, x: dict):
         if len(archive) == 0:
             archive.append(x)
         else:
-            for y in archive:
-                if AMOSA.dominates(x, y):
-                    archive.remove(y)
-            if not any(
-                [AMOSA.dominates(y, x) or AMOSA.is_the_same(x, y) for y in archive]
-            ):
-                archive.append(x)
+            keep, insert = AMOSA.insertion(
+                np.array([y["x"] for y in archive], dtype=np.float64),
+                np.array([y["f"] for y in archive], dtype=np.float64),
+                np.array([y["g"] for y in archive], dtype=np.float64)
+                if x["g"] is not None
+                else None,
+                x,
+            )
+            archive[:] = [y for y, k in zip(archive, keep) if k] + (
+                [x] if insert else []
+            )
 
     @staticmethod
-    def nondominated_merge(archives):
-        nondominated_archive = []
+    def nondominated_merge(problem: Problem, archives):
+        nondominated_archive = AMOSA.Archive(problem, [])
         AMOSA.print_progressbar(0, len(archives), message="Merging archives:")
         for i, archive in enumerate(archives):
             for x in archive:
-                AMOSA.add_to_archive(nondominated_archive, x)
+                nondominated_archive.add(x)
             AMOSA.print_progressbar(i + 1, len(archives), message="Merging archives:")
-        return nondominated_archive
+        return nondominated_archive.solutions
 
     @staticmethod
     def compute_cv(archive: List[dict]):
-        g = np.array([s["g"] for s in archive])
-        feasible = np.all(np.less(g, 0), axis=1).sum()
-        g = g[np.where(g > 0)]
+        g = np.array([s["g"] for s in archive], dtype=np.float64)
+        feasible = np.count_nonzero((g < 0).all(axis=1))
+        g = g[g > 0]
         return (
             feasible,
             0 if len(g) == 0 else np.nanmin(g),
@@ -457,11 +851,44 @@ class AMOSA:
         return archive
 
     @staticmethod
-    def remove_dominated(archive: List[dict]):
-        nondominated_archive = []
+    def pareto_mask_2d(F: np.ndarray):
+        """
+        Returns the mask of the non-dominated rows of the two-objectives matrix F, in O(N log N) rather than O(N^2):
+        once rows are sorted by the first objective, and then by the second, a row is dominated if and only if any of
+        the rows preceding its group of equal rows has a lower or equal second objective.
+        """
+        order = np.lexsort((F[:, 1], F[:, 0]))
+        f = F[order]
+        new_group = np.ones(len(f), dtype=bool)
+        new_group[1:] = (f[1:] != f[:-1]).any(axis=1)
+        group_start = np.maximum.accumulate(np.where(new_group, np.arange(len(f)), 0))
+        min_before = np.concatenate(([np.inf], np.minimum.accumulate(f[:-1, 1])))
+        mask = np.empty(len(f), dtype=bool)
+        mask[order] = min_before[group_start] > f[:, 1]
+        return mask
+
+    @staticmethod
+    def remove_dominated(problem: Problem, archive: List[dict]):
+        if (
+            problem.num_of_constraints == 0
+            and problem.num_of_objectives == 2
+            and len(archive) > 0
+        ):
+            F = np.array([s["f"] for s in archive], dtype=np.float64)
+            if F.shape[1] == 2 and np.isfinite(F).all():
+                # copies of the same solution are kept once, as Archive.add() does
+                nondominated, seen = [], set()
+                for s, keep in zip(archive, AMOSA.pareto_mask_2d(F)):
+                    if keep:
+                        key = problem.get_cache_key(s)
+                        if key not in seen:
+                            nondominated.append(s)
+                            seen.add(key)
+                return nondominated
+        nondominated_archive = AMOSA.Archive(problem, [])
         for x in archive:
-            AMOSA.add_to_archive(nondominated_archive, x)
-        return nondominated_archive
+            nondominated_archive.add(x)
+        return nondominated_archive.solutions
 
     @staticmethod
     def clustering(
@@ -471,87 +898,62 @@ class AMOSA:
         max_iterations: int,
         print_allowed,
     ):
-        if problem.num_of_constraints > 0:
-            feasible = [s for s in archive if all([g <= 0 for g in s["g"]])]
-            unfeasible = [s for s in archive if any([g > 0 for g in s["g"]])]
-            if len(feasible) > hard_limit:
-                return AMOSA.kmeans_clustering(
-                    feasible, hard_limit, max_iterations, print_allowed
-                )
-            elif len(feasible) < hard_limit and len(unfeasible) != 0:
-                return feasible + AMOSA.kmeans_clustering(
-                    unfeasible,
-                    hard_limit - len(feasible),
-                    max_iterations,
-                    print_allowed,
-                )
-            else:
-                return feasible
-        else:
-            return AMOSA.kmeans_clustering(
-                archive, hard_limit, max_iterations, print_allowed
-            )
+        return (
+            AMOSA.Archive(problem, archive)
+            .cluster(hard_limit, max_iterations, print_allowed)
+            .solutions
+        )
 
     @staticmethod
-    def centroid_of_set(input_set):
-        d = np.array(
-            [
-                np.nansum(
-                    [
-                        np.linalg.norm(np.array(i["f"]) - np.array(j["f"]))
-                        if not np.array_equal(np.array(i["x"]), np.array(j["x"]))
-                        else np.nan
-                        for j in input_set
-                    ]
-                )
-                for i in input_set
-            ]
+    def pairwise_distances(F: np.ndarray, X: np.ndarray):
+        """
+        Returns the matrix of pairwise distances, in the objective space, between the rows of F, and a copy of it where
+        distances between rows sharing the same decision variables in X are NaN, as such pairs are not taken into
+        account while computing centroids.
+        """
+        distances = np.linalg.norm(F[:, np.newaxis, :] - F[np.newaxis, :, :], axis=2)
+        centroid_distances = np.where(
+            (X[:, np.newaxis, :] == X[np.newaxis, :, :]).all(axis=2),
+            np.nan,
+            distances,
         )
-        return input_set[np.nanargmin(d)]
+        return distances, centroid_distances
 
     @staticmethod
-    def kmeans_clustering(archive, num_of_clusters, max_iterations, print_allowed):
+    def centroid_of_set(F: np.ndarray, X: np.ndarray):
+        _, centroid_distances = AMOSA.pairwise_distances(F, X)
+        return np.nanargmin(np.nansum(centroid_distances, axis=1))
+
+    @staticmethod
+    def kmeans_clustering(
+        F: np.ndarray, X: np.ndarray, num_of_clusters, max_iterations, print_allowed
+    ):
+        """
+        Clusters the rows of F, returning the indexes of the centroids.
+        """
         assert max_iterations > 0
-        if 1 < num_of_clusters < len(archive):
+        if 1 < num_of_clusters < len(F):
+            # Pairwise distances, in the objective space, are computed once and for all: both the k-means++
+            # initialization and the k-means iterations only ever look up these matrices by point index.
+            distances, centroid_distances = AMOSA.pairwise_distances(F, X)
             # Initialize the centroids, using the "k-means++" method, where a random datapoint is selected as the first,
             # then the rest are initialized w/ probabilities proportional to their distances to the first
             # Pick a random point from train data for first centroid
-            centroids = [random.choice(archive)]
+            centroids = [random.randrange(len(F))]
             if print_allowed:
                 AMOSA.print_progressbar(
                     1, num_of_clusters, message="Clustering (centroids):"
                 )
             for n in range(num_of_clusters - 1):
                 # Calculate normalized distances from points to the centroids
-                dists = np.array(
-                    [
-                        np.nansum(
-                            [
-                                np.linalg.norm(
-                                    np.array(centroid["f"]) - np.array(p["f"])
-                                )
-                                for centroid in centroids
-                            ]
-                        )
-                        for p in archive
-                    ]
+                dists = np.nansum(distances[:, centroids], axis=1)
+                total = np.nansum(dists)
+                # when all the points coincide with the centroids, or distances are not finite, any point is as good
+                normalized_dists = (
+                    dists / total if 0 < total < np.inf else np.full(len(F), 1 / len(F))
                 )
-                try:
-                    normalized_dists = dists / np.nansum(dists)
-                    # Choose remaining points based on their distances
-                    new_centroid_idx = np.random.choice(
-                        range(len(archive)), size=1, p=normalized_dists
-                    )[
-                        0
-                    ]  # Indexed @ zero to get val, not array of val
-                    centroids += [archive[new_centroid_idx]]
-                except (RuntimeWarning, RuntimeError, FloatingPointError) as e:
-                    print(e)
-                    print(f"Archive: {archive}")
-                    print(f"Centroids: {centroids}")
-                    print(f"Distance: {dists}")
-                    print(f"Normalized distance: {dists / np.nansum(dists)}")
-                    exit()
+                # Choose remaining points based on their distances
+                centroids.append(np.random.choice(len(F), p=normalized_dists))
                 if print_allowed:
                     AMOSA.print_progressbar(
                         n, num_of_clusters, message="Clustering (centroids):"
@@ -563,44 +965,59 @@ class AMOSA:
                 )
             for n in range(max_iterations):
                 # Sort each datapoint, assigning to nearest centroid
-                sorted_points = [[] for _ in range(num_of_clusters)]
-                for x in archive:
-                    dists = [
-                        np.linalg.norm(np.array(x["f"]) - np.array(centroid["f"]))
-                        for centroid in centroids
-                    ]
-                    centroid_idx = np.argmin(dists)
-                    sorted_points[centroid_idx].append(x)
+                assignment = np.argmin(distances[:, centroids], axis=1)
+                # Points are grouped by cluster with a single sort, rather than scanning the assignment once per cluster
+                members = np.argsort(assignment, kind="stable")
+                bounds = np.searchsorted(
+                    assignment[members], np.arange(len(centroids) + 1)
+                )
                 # Push current centroids to previous, reassign centroids as mean of the points belonging to them
                 prev_centroids = centroids
-                centroids = [
-                    AMOSA.centroid_of_set(cluster) if len(cluster) != 0 else centroid
-                    for cluster, centroid in zip(sorted_points, prev_centroids)
-                ]
+                centroids = []
+                for c, centroid in enumerate(prev_centroids):
+                    cluster = members[bounds[c] : bounds[c + 1]]
+                    centroids.append(
+                        cluster[
+                            np.nanargmin(
+                                np.nansum(
+                                    centroid_distances[np.ix_(cluster, cluster)],
+                                    axis=1,
+                                )
+                            )
+                        ]
+                        if len(cluster) != 0
+                        else centroid
+                    )
                 if print_allowed:
                     AMOSA.print_progressbar(
                         n, max_iterations, message="Clustering (kmeans):"
                     )
-                if np.array_equal(centroids, prev_centroids) and print_allowed:
-                    AMOSA.print_progressbar(
-                        max_iterations, max_iterations, message="Clustering (kmeans):"
-                    )
+                if centroids == prev_centroids:
+                    if print_allowed:
+                        AMOSA.print_progressbar(
+                            max_iterations,
+                            max_iterations,
+                            message="Clustering (kmeans):",
+                        )
                     break
             print("", end="\r", flush=True)
             return centroids
         elif num_of_clusters == 1:
-            return [AMOSA.centroid_of_set(archive)]
+            return [AMOSA.centroid_of_set(F, X)]
         else:
-            return archive
+            return list(range(len(F)))
 
     @staticmethod
     def inverted_generational_distance(p_t, p_tau):
-        return np.nansum(
-            [np.nanmin([np.linalg.norm(p - q) for q in p_t[:]]) for p in p_tau[:]]
-        ) / len(p_tau)
+        p_t = np.asarray(p_t, dtype=np.float64)
+        p_tau = np.asarray(p_tau, dtype=np.float64)
+        # distances between each point of p_tau (rows) and each point of p_t (columns)
+        distances = np.linalg.norm(
+            p_tau[:, np.newaxis, :] - p_t[np.newaxis, :, :], axis=2
+        )
+        return np.nansum(np.nanmin(distances, axis=1)) / len(p_tau)
 
     def __init__(self, config: AMOSAConfig):
-        warnings.filterwarnings("error")
         self.__archive_hard_limit = config.archive_hard_limit
         self.__archive_soft_limit = config.archive_soft_limit
         self.__archive_gamma = config.archive_gamma
@@ -611,7 +1028,7 @@ class AMOSA:
         self.__cooling_factor = config.cooling_factor
         self.__annealing_iterations = config.annealing_iterations
         self.__annealing_strength = config.annealing_strength
-        self.__early_termination_window = config.early_terminator_window
+        self.__early_termination_window = config.early_termination_window
         self.__multiprocessing_enables = config.multiprocessing_enabled
         self.hill_climb_checkpoint_file = "hill_climb_checkpoint.json"
         self.minimize_checkpoint_file = "minimize_checkpoint.json"
@@ -684,7 +1101,7 @@ class AMOSA:
         self.__ax = None
         self.__line = None
         self.__archive = AMOSA.remove_infeasible(problem, self.__archive)
-        self.__archive = AMOSA.remove_dominated(self.__archive)
+        self.__archive = AMOSA.remove_dominated(problem, self.__archive)
         if len(self.__archive) > self.__archive_hard_limit:
             self.__archive = AMOSA.clustering(
                 self.__archive,
@@ -715,6 +1132,8 @@ class AMOSA:
         fig_title: str = "Pareto front",
         axis_labels=None,
     ):
+        import matplotlib.pyplot as plt
+
         if axis_labels is None:
             axis_labels = ["f" + str(i) for i in range(problem.num_of_objectives)]
         F = self.pareto_front()
@@ -749,7 +1168,6 @@ class AMOSA:
             exit()
 
     def archive_to_csv(self, problem: Problem, csv_file: str, fitness_labels=None):
-        original_stdout = sys.stdout
         row_format = (
             "{:};"
             + "{:};" * problem.num_of_objectives
@@ -757,20 +1175,19 @@ class AMOSA:
         )
         if fitness_labels is None:
             fitness_labels = [f"f{i}" for i in range(problem.num_of_objectives)]
+        F = self.pareto_front()
+        X = self.pareto_set()
         with open(csv_file, "w") as file:
-            sys.stdout = file
             print(
                 row_format.format(
                     "",
                     *fitness_labels,
                     *[f"x{i}" for i in range(problem.num_of_variables)],
-                )
+                ),
+                file=file,
             )
-            for i, f, x in zip(
-                range(len(self.pareto_front())), self.pareto_front(), self.pareto_set()
-            ):
-                print(row_format.format(i, *f, *x))
-        sys.stdout = original_stdout
+            for i, (f, x) in enumerate(zip(F, X)):
+                print(row_format.format(i, *f, *x), file=file)
 
     def __random_archive(self, problem: Problem):
         print("Initializing random archive...")
@@ -825,42 +1242,48 @@ class AMOSA:
                 num_of_initial_candidate_solutions,
                 message="Hill climbing:",
             )
-            if self.__multiprocessing_enables:
-                args = [[problem, self.__hill_climbing_iterations]] * cpu_count()
-                for i in range(
-                    len(initial_candidate_solutions),
-                    num_of_initial_candidate_solutions,
-                    cpu_count(),
-                ):
-                    with Pool(cpu_count()) as pool:
-                        new_points = pool.starmap(AMOSA.hillclimb_thread_loop, args)
-                    initial_candidate_solutions += new_points
-                    self.__save_checkpoint_hillclimb(initial_candidate_solutions)
-                    AMOSA.print_progressbar(
-                        i + cpu_count(),
-                        num_of_initial_candidate_solutions,
-                        message=f"Hill climbing:",
+            starting_points = AMOSA.random_points(
+                problem,
+                max(
+                    num_of_initial_candidate_solutions
+                    - len(initial_candidate_solutions),
+                    0,
+                ),
+            )
+            # a single pool serves the whole hill-climbing phase; results are collected in order, as they are ready
+            with (
+                Pool(cpu_count(), AMOSA.init_worker, (problem,))
+                if self.__multiprocessing_enables
+                else nullcontext()
+            ) as pool:
+                for i, x in enumerate(
+                    map(
+                        partial(
+                            AMOSA.hill_climbing,
+                            problem,
+                            max_iterations=self.__hill_climbing_iterations,
+                        ),
+                        starting_points,
                     )
-            else:
-                for i in range(
-                    len(initial_candidate_solutions), num_of_initial_candidate_solutions
+                    if pool is None
+                    else pool.imap(
+                        partial(
+                            AMOSA.hill_climbing_worker,
+                            max_iterations=self.__hill_climbing_iterations,
+                        ),
+                        starting_points,
+                    ),
+                    len(initial_candidate_solutions) + 1,
                 ):
-                    initial_candidate_solutions.append(
-                        AMOSA.hillclimb_thread_loop(
-                            problem, self.__hill_climbing_iterations
-                        )
-                    )
+                    initial_candidate_solutions.append(x)
                     self.__save_checkpoint_hillclimb(initial_candidate_solutions)
                     AMOSA.print_progressbar(
                         i, num_of_initial_candidate_solutions, message="Hill climbing:"
                     )
-        for x in initial_candidate_solutions:
-            AMOSA.add_to_archive(self.__archive, x)
-
-    @staticmethod
-    def hillclimb_thread_loop(problem, hillclimb_iterations):
-        return AMOSA.hill_climbing(
-            problem, AMOSA.random_point(problem), hillclimb_iterations
+            # solutions climbed by worker processes are not in the cache of the main process
+            problem.archive_to_cache(initial_candidate_solutions)
+        self.__archive = AMOSA.remove_dominated(
+            problem, self.__archive + initial_candidate_solutions
         )
 
     def __main_loop(self, problem: Problem, plot):
@@ -869,7 +1292,6 @@ class AMOSA:
             if self.__multiprocessing_enables:
                 args = [
                     [
-                        problem,
                         self.__archive.copy(),
                         random.choice(self.__archive),
                         self.__current_temperature,
@@ -883,9 +1305,10 @@ class AMOSA:
                     ]
                     for i in [t == 0 for t in range(cpu_count())]
                 ]
-                with Pool(cpu_count()) as pool:
-                    archives = pool.starmap(AMOSA.annealing_thread_loop, args)
-                self.__archive = AMOSA.nondominated_merge(archives)
+                with Pool(cpu_count(), AMOSA.init_worker, (problem,)) as pool:
+                    archives = pool.starmap(AMOSA.annealing_worker, args)
+                self.__archive = AMOSA.nondominated_merge(problem, archives)
+                problem.archive_to_cache(self.__archive)
                 self.__n_eval += self.__annealing_iterations * cpu_count()
             else:
                 self.__archive = AMOSA.annealing_thread_loop(
@@ -918,6 +1341,19 @@ class AMOSA:
             problem.store_cache(self.cache_dir)
             self.__check_early_termination()
 
+    @staticmethod
+    def init_worker(problem: Problem):
+        # the problem is handed to each worker process once, when the pool is created, rather than along with each task
+        AMOSA.worker_problem = problem
+
+    @staticmethod
+    def hill_climbing_worker(x, max_iterations):
+        return AMOSA.hill_climbing(AMOSA.worker_problem, x, max_iterations)
+
+    @staticmethod
+    def annealing_worker(*args):
+        return AMOSA.annealing_thread_loop(AMOSA.worker_problem, *args)
+
     @staticmethod
     def annealing_thread_loop(
         problem: Problem,
@@ -932,94 +1368,73 @@ class AMOSA:
         clustering_before_return,
         print_allowed: bool,
     ):
+        archive = AMOSA.Archive(problem, archive, soft_limit + 1)
+        dominates = AMOSA.dominance_function(problem)
+        # acceptance thresholds for the whole annealing round are drawn at once. The generator is seeded from the
+        # random module, which is reseeded in each forked worker, so that parallel runs do not share the same stream
+        thresholds = np.random.default_rng(random.getrandbits(64)).random(
+            annealing_iterations
+        )
         if print_allowed:
             AMOSA.print_progressbar(0, annealing_iterations, message="Annealing:")
+        random_perturbation = AMOSA.random_perturbation
+        domination_amounts = AMOSA.domination_amounts
+        sigmoid = AMOSA.sigmoid
+        accept = AMOSA.accept
         for iter in range(annealing_iterations):
-            new_point = AMOSA.random_perturbation(
-                problem, current_point, annealing_strength
-            )
-            fitness_range = AMOSA.compute_fitness_range(
-                archive, current_point, new_point
+            new_point = random_perturbation(problem, current_point, annealing_strength)
+            fitness_range, dominating_y, dominated_by_y = archive.classify(
+                current_point, new_point
             )
-            s_dominating_y = [s for s in archive if AMOSA.dominates(s, new_point)]
-            s_dominated_by_y = [s for s in archive if AMOSA.dominates(new_point, s)]
-            k_s_dominated_by_y = len(s_dominated_by_y)
-            k_s_dominating_y = len(s_dominating_y)
-            if AMOSA.dominates(current_point, new_point) and k_s_dominating_y >= 0:
+            k_s_dominating_y = np.count_nonzero(dominating_y)
+            if dominates(current_point, new_point):
                 delta_avg = (
                     np.nansum(
-                        [
-                            AMOSA.domination_amount(s, new_point, fitness_range)
-                            for s in s_dominating_y
-                        ]
+                        domination_amounts(
+                            archive.F[dominating_y], new_point, fitness_range
+                        )
                     )
                     + AMOSA.domination_amount(current_point, new_point, fitness_range)
                 ) / (k_s_dominating_y + 1)
-                if AMOSA.accept(AMOSA.sigmoid(-delta_avg * current_temperature)):
+                if accept(sigmoid(-delta_avg * current_temperature), thresholds[iter]):
                     current_point = new_point
-            elif not AMOSA.dominates(current_point, new_point) and not AMOSA.dominates(
-                new_point, current_point
-            ):
-                if k_s_dominating_y >= 1:
-                    delta_avg = (
-                        np.nansum(
-                            [
-                                AMOSA.domination_amount(s, new_point, fitness_range)
-                                for s in s_dominating_y
-                            ]
-                        )
-                        / k_s_dominating_y
-                    )
-                    if AMOSA.accept(AMOSA.sigmoid(-delta_avg * current_temperature)):
+            elif k_s_dominating_y >= 1:
+                dominating_y_idx = np.flatnonzero(dominating_y)
+                delta_dom = domination_amounts(
+                    archive.F[dominating_y_idx], new_point, fitness_range
+                )
+                if dominates(new_point, current_point):
+                    # the least-dominating solution is selected among those dominating y, not among the whole archive
+                    min_idx = np.argmin(delta_dom)
+                    if accept(sigmoid(delta_dom[min_idx]), thresholds[iter]):
+                        current_point = archive.solutions[dominating_y_idx[min_idx]]
+                else:
+                    delta_avg = np.nansum(delta_dom) / k_s_dominating_y
+                    if accept(
+                        sigmoid(-delta_avg * current_temperature), thresholds[iter]
+                    ):
                         current_point = new_point
-                elif (
-                    k_s_dominating_y == 0 and k_s_dominated_by_y == 0
-                ) or k_s_dominated_by_y >= 1:
-                    AMOSA.add_to_archive(archive, new_point)
-                    current_point = new_point
-                    if len(archive) > soft_limit:
-                        archive = AMOSA.clustering(
-                            archive,
-                            problem,
-                            hard_limit,
-                            clustering_max_iterations,
-                            print_allowed,
-                        )
-            elif AMOSA.dominates(new_point, current_point):
-                if k_s_dominating_y >= 1:
-                    delta_dom = [
-                        AMOSA.domination_amount(s, new_point, fitness_range)
-                        for s in s_dominating_y
-                    ]
-                    if AMOSA.accept(AMOSA.sigmoid(min(delta_dom))):
-                        current_point = archive[np.argmin(delta_dom)]
-                elif (
-                    k_s_dominating_y == 0 and k_s_dominated_by_y == 0
-                ) or k_s_dominated_by_y >= 1:
-                    AMOSA.add_to_archive(archive, new_point)
-                    current_point = new_point
-                    if len(archive) > soft_limit:
-                        archive = AMOSA.clustering(
-                            archive,
-                            problem,
-                            hard_limit,
-                            clustering_max_iterations,
-                            print_allowed,
-                        )
             else:
-                raise RuntimeError(
-                    f"Something went wrong\narchive: {archive}\nx:{current_point}\ny: {new_point}\n x < y: {AMOSA.dominates(current_point, new_point)}\n y < x: {AMOSA.dominates(new_point, current_point)}\ny domination rank: {k_s_dominated_by_y}\narchive domination rank: {k_s_dominating_y}"
-                )
+                # y is not dominated by any archived solution, whether it dominates some of them or not
+                archive.add(new_point)
+                current_point = new_point
+                if len(archive) > soft_limit:
+                    archive = archive.cluster(
+                        hard_limit,
+                        clustering_max_iterations,
+                        print_allowed,
+                        soft_limit + 1,
+                    )
             if print_allowed:
                 AMOSA.print_progressbar(
                     iter + 1, annealing_iterations, message="Annealing:"
                 )
         return (
-            archive
+            archive.solutions
             if not clustering_before_return
-            else AMOSA.clustering(
-                archive, problem, hard_limit, clustering_max_iterations, print_allowed
-            )
+            else archive.cluster(
+                hard_limit, clustering_max_iterations, print_allowed
+            ).solutions
         )
 
     @staticmethod
@@ -1096,14 +1511,9 @@ class AMOSA:
         objectives = np.array([s["f"] for s in self.__archive])
         nadir = np.nanmax(objectives, axis=0)
         ideal = np.nanmin(objectives, axis=0)
-        normalized_objectives = np.array([])
-        try:
-            normalized_objectives = np.array(
-                [
-                    [(p - i) / (n - i) for p, i, n in zip(x, ideal, nadir)]
-                    for x in objectives[:]
-                ]
-            )
+        # degenerate fronts, e.g. made of a single solution, have null ranges: statistics are NaN or infinite then
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalized_objectives = (objectives - ideal) / (nadir - ideal)
             retvalue = (0, 0, 0)
             if (
                 self.__nadir is not None
@@ -1111,20 +1521,10 @@ class AMOSA:
                 and self.__old_norm_objectives is not None
                 and len(self.__old_norm_objectives) != 0
             ):
-                delta_nad = np.nanmax(
-                    [
-                        (nad_t_1 - nad_t) / (nad_t_1 - id_t)
-                        for nad_t_1, nad_t, id_t in zip(self.__nadir, nadir, ideal)
-                    ]
-                )
-                delta_ideal = np.nanmax(
-                    [
-                        (id_t_1 - id_t) / (nad_t_1 - id_t)
-                        for id_t_1, id_t, nad_t_1 in zip(
-                            self.__ideal, ideal, self.__nadir
-                        )
-                    ]
-                )
+                old_nadir = np.asarray(self.__nadir)
+                old_ideal = np.asarray(self.__ideal)
+                delta_nad = np.nanmax((old_nadir - nadir) / (old_nadir - ideal))
+                delta_ideal = np.nanmax((old_ideal - ideal) / (old_nadir - ideal))
                 phy = AMOSA.inverted_generational_distance(
                     self.__old_norm_objectives, normalized_objectives
                 )
@@ -1134,12 +1534,6 @@ class AMOSA:
             self.__ideal = ideal
             self.__old_norm_objectives = normalized_objectives
             return retvalue
-        except (RuntimeWarning, RuntimeError, FloatingPointError) as e:
-            print(e)
-            print(f"Objectives: {objectives}")
-            print(f"Nadir: {nadir}, Ideal: {ideal}")
-            print(f"Normalized objectives: {normalized_objectives}")
-            exit()
 
     def __print_statistics(self, problem):
         delta_nad, delta_ideal, phy = self.__compute_deltas()
@@ -1171,6 +1565,8 @@ class AMOSA:
             )
 
     def __continuous_plot(self, problem):
+        import matplotlib.pyplot as plt
+
         F = self.pareto_front()
         axis_labels = ["f" + str(i) for i in range(problem.num_of_objectives)]
         if self.__fig is None:
@@ -1203,8 +1599,9 @@ class AMOSA:
         if self.__early_termination_window == 0:
             self.__current_temperature *= self.__cooling_factor
         else:
-            if len(self.__phy) > self.__early_termination_window and all(
-                self.__phy[-self.__early_termination_window :] <= np.finfo(float).eps
+            if len(self.__phy) > self.__early_termination_window and np.all(
+                np.asarray(self.__phy[-self.__early_termination_window :])
+                <= np.finfo(float).eps
             ):
                 print("Early-termination criterion has been met!")
                 self.__current_temperature = self.__final_temperature
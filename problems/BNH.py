@@ -35,36 +35,32 @@ class BNH(AMOSA.Problem):
         )
 
     def evaluate(self, x, out):
-        f1 = 4 * x[0] ** 2 + 4 * x[1] ** 2
-        f2 = (x[0] - 5) ** 2 + (x[1] - 5) ** 2
-        g1 = (x[0] - 5) ** 2 + x[1] ** 2 - 25
-        g2 = 7.7 - (x[0] - 5) ** 2 - (x[1] + 3) ** 2
+        x1, x2 = x
+        # (x1 - 5)^2 appears in three of the four functions, so it is computed once
+        d1 = (x1 - 5) ** 2
+        f1 = 4 * x1**2 + 4 * x2**2
+        f2 = d1 + (x2 - 5) ** 2
+        g1 = d1 + x2**2 - 25
+        g2 = 7.7 - d1 - (x2 + 3) ** 2
         out["f"] = [f1, f2]
         out["g"] = [g1, g2]
 
+    def evaluate_batch(self, X, out):
+        X = np.asarray(X, dtype=np.float64)
+        x1, x2 = X[:, 0], X[:, 1]
+        d1 = (x1 - 5) ** 2
+        f1 = 4 * x1**2 + 4 * x2**2
+        f2 = d1 + (x2 - 5) ** 2
+        g1 = d1 + x2**2 - 25
+        g2 = 7.7 - d1 - (x2 + 3) ** 2
+        out["f"] = np.column_stack((f1, f2)).tolist()
+        out["g"] = np.column_stack((g1, g2)).tolist()
+
     def optimums(self):
-        pareto_set = np.linspace(0, 3, 100)
-        out = [
-            {
-                "x": [x, x],
-                "f": [0] * self.num_of_objectives,
-                "g": [0] * self.num_of_constraints
-                if self.num_of_constraints > 0
-                else None,
-            }
-            for x in pareto_set
-        ]
-        pareto_set = np.linspace(3, 5, 100)
-        out = out + [
-            {
-                "x": [x, 3],
-                "f": [0] * self.num_of_objectives,
-                "g": [0] * self.num_of_constraints
-                if self.num_of_constraints > 0
-                else None,
-            }
-            for x in pareto_set
+        x = np.concatenate((np.linspace(0, 3, 100), np.linspace(3, 5, 100)))
+        X = np.column_stack((x, np.minimum(x, 3)))
+        out = {"f": [None] * len(X), "g": [None] * len(X)}
+        self.evaluate_batch(X, out)
+        return [
+            {"x": x, "f": f, "g": g} for x, f, g in zip(X.tolist(), out["f"], out["g"])
         ]
-        for o in out:
-            self.evaluate(o["x"], o)
-        return out
@@ -41,22 +41,22 @@ class ZDT2(AMOSA.Problem):
         out["f"] = [f, g * h]
         pass
 
+    def evaluate_batch(self, X, out):
+        X = np.asarray(X, dtype=np.float64)
+        f = X[:, 0]
+        g = 1 + 9 * X[:, 1:].sum(axis=1) / (self.num_of_variables - 1)
+        h = 1 - (f / g) ** 2
+        out["f"] = np.column_stack((f, g * h)).tolist()
+
     def optimums(self):
         """
         Optimum:
         0 <= x_1 <= 1, x_i = 0 for each i in 2...n
         """
-        pareto_set = np.linspace(0, 1, 100)
-        out = [
-            {
-                "x": [x] + [0] * (ZDT2.n_var - 1),
-                "f": [0] * self.num_of_objectives,
-                "g": [0] * self.num_of_constraints
-                if self.num_of_constraints > 0
-                else None,
-            }
-            for x in pareto_set
+        X = np.zeros((100, ZDT2.n_var))
+        X[:, 0] = np.linspace(0, 1, 100)
+        out = {"f": [None] * len(X), "g": [None] * len(X)}
+        self.evaluate_batch(X, out)
+        return [
+            {"x": x, "f": f, "g": g} for x, f, g in zip(X.tolist(), out["f"], out["g"])
         ]
-        for o in out:
-            self.evaluate(o["x"], o)
-        return out
@@ -14,7 +14,7 @@ You should have received a copy of the GNU General Public License along with
 RMEncoder; if not, write to the Free Software Foundation, Inc., 51 Franklin
 Street, Fifth Floor, Boston, MA 02110-1301, USA.
 """
-import os, sys
+import os, sys, math
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from AMOSA import *
@@ -38,10 +38,17 @@ class ZDT3(AMOSA.Problem):
     def evaluate(self, x, out):
         f = x[0]
         g = 1 + 9 * sum(x[1:]) / (self.num_of_variables - 1)
-        h = 1 - np.sqrt(f / g) - (f / g) * np.sin(10 * np.pi * f)
+        h = 1 - math.sqrt(f / g) - (f / g) * math.sin(10 * math.pi * f)
         out["f"] = [f, g * h]
         pass
 
+    def evaluate_batch(self, X, out):
+        X = np.asarray(X, dtype=np.float64)
+        f = X[:, 0]
+        g = 1 + 9 * X[:, 1:].sum(axis=1) / (self.num_of_variables - 1)
+        h = 1 - np.sqrt(f / g) - (f / g) * np.sin(10 * np.pi * f)
+        out["f"] = np.column_stack((f, g * h)).tolist()
+
     def optimums(self):
         """
         Optimum:
@@ -52,23 +59,16 @@ class ZDT3(AMOSA.Problem):
         0.8233 ≤𝑥_1 ≤ 0.8518
         𝑥_𝑖 = 0 for 𝑖 = 2,...,𝑛
         """
-        out = []
         bounds = [
             [0, 0.1822, 0.4093, 0.6183, 0.8233],
             [0.0830, 0.2577, 0.4538, 0.6525, 0.8518],
         ]
-        for i in range(len(bounds[0])):
-            pareto_set = np.linspace(bounds[0][i], bounds[1][i], 100)
-            out = out + [
-                {
-                    "x": [x] + [0] * (ZDT3.n_var - 1),
-                    "f": [0] * self.num_of_objectives,
-                    "g": [0] * self.num_of_constraints
-                    if self.num_of_constraints > 0
-                    else None,
-                }
-                for x in pareto_set
-            ]
-        for o in out:
-            self.evaluate(o["x"], o)
-        return out
+        X = np.zeros((100 * len(bounds[0]), ZDT3.n_var))
+        X[:, 0] = np.concatenate(
+            [np.linspace(lb, ub, 100) for lb, ub in zip(bounds[0], bounds[1])]
+        )
+        out = {"f": [None] * len(X), "g": [None] * len(X)}
+        self.evaluate_batch(X, out)
+        return [
+            {"x": x, "f": f, "g": g} for x, f, g in zip(X.tolist(), out["f"], out["g"])
+        ]
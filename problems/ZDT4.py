@@ -14,7 +14,7 @@ You should have received a copy of the GNU General Public License along with
 RMEncoder; if not, write to the Free Software Foundation, Inc., 51 Franklin
 Street, Fifth Floor, Boston, MA 02110-1301, USA.
 """
-import os, sys
+import os, sys, math
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from AMOSA import *
@@ -36,27 +36,27 @@ class ZDT4(AMOSA.Problem):
 
     def evaluate(self, x, out):
         f = x[0]
-        g = 1 + 10 * 9 + sum([i**2 - 10 * np.cos(4 * np.pi * i) for i in x[1:]])
-        h = 1 - np.sqrt(f / g)
+        g = 1 + 10 * 9 + sum(i**2 - 10 * math.cos(4 * math.pi * i) for i in x[1:])
+        h = 1 - math.sqrt(f / g)
         out["f"] = [f, g * h]
         pass
 
+    def evaluate_batch(self, X, out):
+        X = np.asarray(X, dtype=np.float64)
+        f = X[:, 0]
+        g = 1 + 10 * 9 + (X[:, 1:] ** 2 - 10 * np.cos(4 * np.pi * X[:, 1:])).sum(axis=1)
+        h = 1 - np.sqrt(f / g)
+        out["f"] = np.column_stack((f, g * h)).tolist()
+
     def optimums(self):
         """
         Optimum:
         0 <= x_1 <= 1, x_i = 0 for each i in 2...n
         """
-        pareto_set = np.linspace(0, 1, 100)
-        out = [
-            {
-                "x": [x] + [0] * (ZDT4.n_var - 1),
-                "f": [0] * self.num_of_objectives,
-                "g": [0] * self.num_of_constraints
-                if self.num_of_constraints > 0
-                else None,
-            }
-            for x in pareto_set
+        X = np.zeros((100, ZDT4.n_var))
+        X[:, 0] = np.linspace(0, 1, 100)
+        out = {"f": [None] * len(X), "g": [None] * len(X)}
+        self.evaluate_batch(X, out)
+        return [
+            {"x": x, "f": f, "g": g} for x, f, g in zip(X.tolist(), out["f"], out["g"])
         ]
-        for o in out:
-            self.evaluate(o["x"], o)
-        return out
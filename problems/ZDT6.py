@@ -14,7 +14,7 @@ You should have received a copy of the GNU General Public License along with
 RMEncoder; if not, write to the Free Software Foundation, Inc., 51 Franklin
 Street, Fifth Floor, Boston, MA 02110-1301, USA.
 """
-import os, sys
+import os, sys, math
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from AMOSA import *
@@ -35,28 +35,28 @@ class ZDT6(AMOSA.Problem):
         )
 
     def evaluate(self, x, out):
-        f = 1 - np.exp(-4 * x[0]) * np.power(np.sin(6 * np.pi * x[0]), 6)
-        g = 1 + 9 * np.power(sum(x[1:]) / 9, 1.0 / 4)
+        f = 1 - math.exp(-4 * x[0]) * math.sin(6 * math.pi * x[0]) ** 6
+        g = 1 + 9 * (sum(x[1:]) / 9) ** (1.0 / 4)
         h = 1 - (f / g) ** 2
         out["f"] = [f, g * h]
         pass
 
+    def evaluate_batch(self, X, out):
+        X = np.asarray(X, dtype=np.float64)
+        f = 1 - np.exp(-4 * X[:, 0]) * np.sin(6 * np.pi * X[:, 0]) ** 6
+        g = 1 + 9 * (X[:, 1:].sum(axis=1) / 9) ** (1.0 / 4)
+        h = 1 - (f / g) ** 2
+        out["f"] = np.column_stack((f, g * h)).tolist()
+
     def optimums(self):
         """
         Optimum:
         0 <= x_1 <= 1, x_i = 0 for each i in 2...n
         """
-        pareto_set = np.linspace(0, 1, 100)
-        out = [
-            {
-                "x": [x] + [0] * (ZDT6.n_var - 1),
-                "f": [0] * self.num_of_objectives,
-                "g": [0] * self.num_of_constraints
-                if self.num_of_constraints > 0
-                else None,
-            }
-            for x in pareto_set
+        X = np.zeros((100, ZDT6.n_var))
+        X[:, 0] = np.linspace(0, 1, 100)
+        out = {"f": [None] * len(X), "g": [None] * len(X)}
+        self.evaluate_batch(X, out)
+        return [
+            {"x": x, "f": f, "g": g} for x, f, g in zip(X.tolist(), out["f"], out["g"])
         ]
-        for o in out:
-            self.evaluate(o["x"], o)
-        return out
@@ -151,7 +151,7 @@ def run(
 ):
     """Run a test problem"""
     problem: AMOSA.Problem = problems[prob]
-    config = AMOSAConfig
+    config = AMOSAConfig()
     config.archive_hard_limit = hard
     config.archive_soft_limit = soft
     config.archive_gamma = gamma
@@ -162,7 +162,7 @@ def run(
     config.cooling_factor = cool
     config.annealing_iterations = iter
     config.annealing_strength = strg
-    config.early_terminator_window = win
+    config.early_termination_window = win
     config.multiprocessing_enabled = True
     optimizer = AMOSA(config)
     optimizer.hill_climb_checkpoint_file = f"{prob}_hill_climbing_checkpoint.json"